@@ -136,35 +136,34 @@ class ActiveStringMatchLearner:
         y_new = np.array([user_input_int], dtype=int)
         return y_new
 
-    def _print_score_histogram(self, X: pd.DataFrame) -> None:
+    def _print_score_histogram(self, similarities: np.ndarray) -> None:
         """
-        Prints histogram of predict_proba scores for X
+        Prints histogram of predict_proba scores for similarities
 
         Args:
-            X: features to calculate predict_proba for
+            similarities: features to calculate predict_proba for
 
         """
-        probas = self.learner.predict_proba(X["similarities"].tolist())[:, 1]
+        probas = self.learner.predict_proba(similarities)[:, 1]
         count, division = np.histogram(probas, bins=np.arange(0, 1.01, 0.05))
         hist = pd.DataFrame({"count": count, "score": division[1:]})
         print(hist[["score", "count"]].to_string(index=False))
         return None
 
-    def fit(self, X: pd.DataFrame) -> "ActiveStringMatchLearner":
+    def fit(self, X: pd.DataFrame, similarities: np.ndarray) -> "ActiveStringMatchLearner":
         """
         Fit ActiveStringMatchLearner instance on pairs of strings
 
         Args:
             X: Pandas dataframe containing pairs of strings
+            similarities: array containing the string similarities per pair, aligned with `X`
         """
         self.parameters = [self._get_lr_params()]
 
         self.train_samples = pd.DataFrame([])
         query_inst_prev = None
         for i in range(N_QUERIES):
-            query_idx, query_inst = self.learner.query(
-                np.array(X["similarities"].tolist())
-            )
+            query_idx, query_inst = self.learner.query(similarities)
             y_new = self._get_active_learning_input(X.iloc[query_idx])
             if y_new == -1:  # use previous (input is 'p')
                 y_new = self._get_active_learning_input(query_inst_prev)
@@ -172,13 +171,14 @@ class ActiveStringMatchLearner:
                 break
             query_inst_prev = X.iloc[query_idx]
             if y_new != 8:  # skip case (input is 's')
-                self.learner.teach([X.iloc[query_idx]["similarities"].iloc[0]], y_new)
+                self.learner.teach(similarities[query_idx], y_new)
                 train_sample_to_add = X.iloc[query_idx].copy()
                 train_sample_to_add["y"] = y_new
                 self.train_samples = self.train_samples.append(
                     train_sample_to_add, ignore_index=True
                 )
             X = X.drop(query_idx).reset_index(drop=True)
+            similarities = np.delete(similarities, query_idx, axis=0)
             self.parameters.append(self._get_lr_params())
             largest_coef_diff = self._get_largest_coef_diff()
             if largest_coef_diff:
@@ -192,7 +192,7 @@ class ActiveStringMatchLearner:
                 self.counter_negative += 1
             self.counter_total += 1
         if self.verbose:
-            self._print_score_histogram(X)
+            self._print_score_histogram(similarities)
         return self
 
     def predict(self, X: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
@@ -1,13 +1,18 @@
-from typing import Callable, Dict, List, Optional, Union
+from typing import Callable, Dict, List, Union
 
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 from sklearn.base import BaseEstimator
 
 from deduplipy.blocking.set_cover import greedy_set_cover
 from deduplipy.config import ROW_ID
 
 
+def _apply_rule(function: Callable, values: pd.Series) -> pd.Series:
+    return values.map(function)
+
+
 class Blocking(BaseEstimator):
     def __init__(
         self,
@@ -15,6 +20,7 @@ class Blocking(BaseEstimator):
         rules_info: Dict,
         recall: float = 1.0,
         save_intermediate_steps: bool = False,
+        n_jobs: int = -1,
     ):
         """
         Class for fitting blocking rules and applying them on new pairs
@@ -24,6 +30,7 @@ class Blocking(BaseEstimator):
             rules_info: dict with column names as keys and a list of blocking functions as values
             recall: minimum recall required
             save_intermediate_steps: whether or not to save intermediate results
+            n_jobs: number of parallel jobs used to apply blocking rules, -1 uses all cores
 
         """
         self.rules_info = rules_info
@@ -31,6 +38,7 @@ class Blocking(BaseEstimator):
         self._get_rules_specs()
         self.recall = recall
         self.save_intermediate_steps = save_intermediate_steps
+        self.n_jobs = n_jobs
 
     def _get_rules_specs(self) -> None:
         self._rules_specs = [
@@ -57,59 +65,28 @@ class Blocking(BaseEstimator):
             fitted instance
 
         """
-        df_training = X.copy()
-        df_training["match"] = y
-
-        def apply_rule(rule: Callable, x: np.ndarray, j: np.ndarray) -> Optional[str]:
-            result = rule(x)
-            if not result:
-                return None
-            else:
-                return result + f":{j}"
-
-        for j, rule_spec in enumerate(self._rules_specs):
-            col_name = rule_spec["col_name"]
-            func_name = rule_spec["function_name"]
-            function = rule_spec["function"]
-            df_training[f"{col_name}_1_{func_name}"] = df_training.apply(
-                lambda row: apply_rule(function, row[f"{col_name}_1"], j), axis=1
-            )
-            df_training[f"{col_name}_2_{func_name}"] = df_training.apply(
-                lambda row: apply_rule(function, row[f"{col_name}_2"], j), axis=1
-            )
-            df_training[f"{col_name}_{func_name}"] = df_training.apply(
-                lambda row: int(
-                    (
-                        (row[f"{col_name}_1_{func_name}"] is not None)
-                        & (row[f"{col_name}_2_{func_name}"] is not None)
-                    )
-                    & (
-                        row[f"{col_name}_1_{func_name}"]
-                        == row[f"{col_name}_2_{func_name}"]
-                    )
-                ),
-                axis=1,
-            )
-            self._rules_specs[j].update(
-                {
-                    "rule_set": set(
-                        df_training[df_training[f"{col_name}_{func_name}"] == 1][
-                            f"{col_name}_{func_name}"
-                        ].index.tolist()
-                    )
-                }
+        # rules are independent of each other, apply them in parallel; the
+        # mapped rule outputs live in local Series only, X is not copied
+        mapped = Parallel(n_jobs=self.n_jobs, prefer="threads")(
+            delayed(_apply_rule)(
+                rule_spec["function"], X[f"{rule_spec['col_name']}_{side}"]
             )
+            for rule_spec in self._rules_specs
+            for side in (1, 2)
+        )
+        for j, rule_spec in enumerate(self._rules_specs):
+            # rules return None when they don't apply
+            s_1 = mapped[2 * j]
+            s_2 = mapped[2 * j + 1]
+            matches = (
+                s_1.notna() & s_2.notna() & (s_1.to_numpy() == s_2.to_numpy())
+            ).to_numpy()
+            rule_spec.update({"rule_set": set(X.index[np.flatnonzero(matches)])})
 
-        # rule_sets = dict
-        # for rule in self.rules:
-        #     for col_name in self.col_names:
-        #         rule_sets.update(
-        #             {f'{col_name}_{rule.__name__}': [rule, rule.__name__, col_name, set(
-        #                 df_training[df_training[f'{col_name}_{rule.__name__}'] == 1][
-        #                     f'{col_name}_{rule.__name__}'].index.tolist())]})
         self.subsets = [x["rule_set"] for x in self._rules_specs]
 
-        self.matches = df_training[df_training.match == 1].index.tolist()
+        y_values = np.asarray(y).reshape(-1)
+        self.matches = X.index[y_values == 1].tolist()
         self.universe = set(self.matches)
 
         self.cover = greedy_set_cover(self.subsets, self.universe, self.recall)
@@ -133,23 +110,29 @@ class Blocking(BaseEstimator):
             Pandas dataframe containing a new column 'fingerprint' with the blocking rules results
 
         """
-        df = X.copy()
-        for j, rule_selected in enumerate(self.rules_selected):
-            col_name = rule_selected["col_name"]
-            func_name = rule_selected["function_name"]
-            function = rule_selected["function"]
-            df[f"{col_name}_{func_name}"] = df[col_name].apply(lambda x: function(x))
-            df.loc[
-                df[f"{col_name}_{func_name}"].notnull(), f"{col_name}_{func_name}"
-            ] = (
-                df[df[f"{col_name}_{func_name}"].notnull()][f"{col_name}_{func_name}"]
-                + f":{j}"
+        # rules are independent of each other, apply them in parallel
+        mapped = Parallel(n_jobs=self.n_jobs, prefer="threads")(
+            delayed(_apply_rule)(rule_selected["function"], X[rule_selected["col_name"]])
+            for rule_selected in self.rules_selected
+        )
+        row_positions = []
+        fingerprint_values = []
+        for j, s in enumerate(mapped):
+            # fingerprints are only ever compared for equality, so an int64
+            # hash of the rule output mixed with the rule index replaces the
+            # "token:rule" string; int64 keys group and merge much faster
+            hashed = pd.util.hash_array(s.to_numpy(dtype=object)) ^ np.uint64(
+                (j * 0x9E3779B97F4A7C15) % (1 << 64)
             )
-        df_melted = df.melt(
-            id_vars=self.col_names + [ROW_ID], value_name="fingerprint"
-        ).drop(columns=["variable"])
-        df_melted.dropna(inplace=True)
-        return df_melted
+            valid = s.notna().to_numpy()
+            row_positions.append(np.flatnonzero(valid))
+            fingerprint_values.append(hashed.view(np.int64)[valid])
+        # stack the per-rule results directly instead of melting a wide frame,
+        # which would duplicate all id_vars columns once per rule
+        positions = np.concatenate(row_positions)
+        stacked = X.iloc[positions][self.col_names + [ROW_ID]].reset_index(drop=True)
+        stacked["fingerprint"] = np.concatenate(fingerprint_values)
+        return stacked
 
     def _create_pairs_table(self, X_fingerprinted: pd.DataFrame) -> pd.DataFrame:
         """
@@ -161,15 +144,34 @@ class Blocking(BaseEstimator):
         Returns:
             pairs table
         """
-        pairs_table = X_fingerprinted.merge(
-            X_fingerprinted, on="fingerprint", suffixes=("_1", "_2")
-        )
+        labels_1, labels_2 = [], []
+        for _, group in X_fingerprinted.groupby("fingerprint", sort=False):
+            if len(group) < 2:
+                continue
+            idx_1, idx_2 = np.triu_indices(len(group), k=1)
+            labels = group.index.to_numpy()
+            labels_1.append(labels[idx_1])
+            labels_2.append(labels[idx_2])
         self.pairs_col_names = [f"{x}_1" for x in self.col_names] + [
             f"{x}_2" for x in self.col_names
         ]
-        pairs_table = pairs_table[
-            pairs_table[f"{ROW_ID}_1"] < pairs_table[f"{ROW_ID}_2"]
-        ]
+        id_cols = self.col_names + [ROW_ID]
+        if not labels_1:
+            return pd.DataFrame(
+                columns=[f"{x}_1" for x in id_cols]
+                + ["fingerprint"]
+                + [f"{x}_2" for x in id_cols]
+            )
+        left = X_fingerprinted.loc[np.concatenate(labels_1)].reset_index(drop=True)
+        right = X_fingerprinted.loc[np.concatenate(labels_2)].reset_index(drop=True)
+        pairs_table = pd.concat(
+            [
+                left[id_cols].add_suffix("_1"),
+                left[["fingerprint"]],
+                right[id_cols].add_suffix("_2"),
+            ],
+            axis=1,
+        )
         return pairs_table
 
     def transform(self, X: pd.DataFrame) -> pd.DataFrame:
@@ -185,7 +187,13 @@ class Blocking(BaseEstimator):
         """
         X_fingerprinted = self._fingerprint(X)
         pairs_table = self._create_pairs_table(X_fingerprinted)
-        pairs_table = pairs_table.drop_duplicates(subset=[f"{ROW_ID}_1", f"{ROW_ID}_2"])
+        # pack both row ids into one int64 key so deduplication across blocks
+        # hashes a single integer column instead of a pair of columns
+        pair_keys = (
+            pairs_table[f"{ROW_ID}_1"].to_numpy(np.int64) << 32
+        ) | pairs_table[f"{ROW_ID}_2"].to_numpy(np.int64)
+        _, unique_idx = np.unique(pair_keys, return_index=True)
+        pairs_table = pairs_table.iloc[np.sort(unique_idx)]
         if self.save_intermediate_steps:
             pairs_table.to_csv("pairs_table.csv", index=None, sep="|")
         return pairs_table
@@ -1,5 +1,6 @@
-import heapq
-from typing import List, Set, Union
+from typing import List, Set
+
+import numpy as np
 
 
 def greedy_set_cover(subsets: List, parent_set: Set, recall: float = 1.0) -> List:
@@ -15,50 +16,36 @@ def greedy_set_cover(subsets: List, parent_set: Set, recall: float = 1.0) -> Lis
         list containing selection of rules that collectively span the parent_set
 
     """
-    # algorithm obtained from stackoverflow post
-    # https://stackoverflow.com/questions/21973126/set-cover-or-hitting-set-numpy-least-element-combinations-to-make-up-full-set
     if not isinstance(parent_set, set):
         parent_set = set(parent_set)
     subsets = [set(x) if not isinstance(x, set) else x for x in subsets]
-    max = len(parent_set)
-    heap: List[List[Union[int, set]]] = []
-    for s in subsets:
-        # Python's heapq lets you pop the *smallest* value, so we
-        # want to use max-len(s) as a score, not len(s).
-        # len(heap) is just proving a unique number to each subset,
-        # used to tiebreak equal scores.
-        heapq.heappush(heap, [max - len(s), len(heap), s])
+
+    # encode membership as a boolean matrix over a contiguous indexing of all
+    # elements, so each greedy iteration is a vectorized count instead of
+    # Python-level set intersections
+    universe = set().union(parent_set, *subsets)
+    index = {element: i for i, element in enumerate(universe)}
+    membership = np.zeros((len(subsets), len(universe)), dtype=bool)
+    for i, subset in enumerate(subsets):
+        membership[i, [index[element] for element in subset]] = True
+    parent_mask = np.zeros(len(universe), dtype=bool)
+    parent_mask[[index[element] for element in parent_set]] = True
+
+    covered = np.zeros(len(universe), dtype=bool)
+    selected = np.zeros(len(subsets), dtype=bool)
     results = []
-    result_set: Set = set()
-    while result_set < parent_set:
-        best = []
-        unused = []
-        while heap:
-            score, count, s = heapq.heappop(heap)
-            if not best:
-                best = [max - len(s - result_set), count, s]
-                continue
-            if score >= best[0]:
-                # because subset scores only get worse as the result_set
-                # gets bigger, we know that the rest of the heap cannot beat
-                # the best score. So push the subset back on the heap, and
-                # stop this iteration.
-                heapq.heappush(heap, [score, count, s])
-                break
-            score = max - len(s - result_set)
-            if score >= best[0]:
-                unused.append([score, count, s])
-            else:
-                unused.append(best)
-                best = [score, count, s]
-        add_set = best[2]
-        results.append(add_set)
-        result_set.update(add_set)
-        coverage = len(result_set.intersection(parent_set)) / len(parent_set)
+    while (parent_mask & ~covered).any():
+        gains = (membership & ~covered).sum(axis=1)
+        gains[selected] = -1
+        # argmax breaks ties on the first (lowest-index) subset
+        best = int(np.argmax(gains))
+        if gains[best] <= 0:
+            break
+        selected[best] = True
+        results.append(subsets[best])
+        covered |= membership[best]
+        coverage = (parent_mask & covered).sum() / parent_mask.sum()
         if coverage >= recall:
             print(f"recall threshold reached, recall = {coverage}")
             return results
-        # subsets that were not the best get put back on the heap for next time.
-        while unused:
-            heapq.heappush(heap, unused.pop())
     return results
@@ -4,24 +4,37 @@ import networkx as nx
 import numpy as np
 import pandas as pd
 import scipy.spatial.distance as ssd
+from joblib import Parallel, delayed
 from scipy.cluster import hierarchy
 
 from deduplipy.config import DEDUPLICATION_ID_NAME, ROW_ID
 
 
 def make_cluster(subgraph: nx.Graph, cluster_threshold: float):
-    adjacency = nx.to_numpy_matrix(subgraph, weight="score")
-    distances = (np.ones_like(adjacency) - np.eye(len(adjacency))) - adjacency
-    condensed_distance = ssd.squareform(distances)
+    adjacency = nx.to_numpy_array(subgraph, weight="score")
+    distances = 1.0 - adjacency
+    np.fill_diagonal(distances, 0.0)
+    condensed_distance = ssd.squareform(distances, checks=False)
     linkage = hierarchy.linkage(condensed_distance, method="centroid")
     clusters = hierarchy.fcluster(
         linkage, t=1 - cluster_threshold, criterion="distance"
     )
-    return clusters
+    return clusters.astype(np.int64)
+
+
+def _cluster_component(subgraph: nx.Graph, cluster_threshold: float):
+    if len(subgraph.nodes) > 1:
+        clusters = make_cluster(subgraph, cluster_threshold)
+    else:
+        clusters = np.array([1])
+    return list(subgraph.nodes()), clusters
 
 
 def hierarchical_clustering(
-    scored_pairs_table: pd.DataFrame, col_names: List, cluster_threshold: float = 0.5
+    scored_pairs_table: pd.DataFrame,
+    col_names: List,
+    cluster_threshold: float = 0.5,
+    n_jobs: int = -1,
 ) -> pd.DataFrame:
     """
     Apply hierarchical clustering to scored_pairs_table and perform the actual deduplication by adding a cluster id to
@@ -31,32 +44,43 @@ def hierarchical_clustering(
         scored_pairs_table: Pandas dataframe containg all pairs and the similarity probability score
         col_names: name to use for deduplication
         cluster_threshold: threshold to apply in hierarchical clustering
+        n_jobs: number of parallel jobs used to cluster connected components, -1 uses all cores
 
     Returns:
         Pandas dataframe containing records with cluster id
 
     """
-    graph = nx.Graph()
-    for j, row in scored_pairs_table.iterrows():
-        graph.add_node(
-            row[f"{ROW_ID}_1"], **{col: row[f"{col}_1"] for col in col_names}
-        )
-        graph.add_node(
-            row[f"{ROW_ID}_2"], **{col: row[f"{col}_2"] for col in col_names}
-        )
-        graph.add_edge(row[f"{ROW_ID}_1"], row[f"{ROW_ID}_2"], score=row["score"])
+    graph = nx.from_pandas_edgelist(
+        scored_pairs_table, f"{ROW_ID}_1", f"{ROW_ID}_2", edge_attr="score"
+    )
+    records = pd.concat(
+        [
+            scored_pairs_table[
+                [f"{ROW_ID}_{suffix}"] + [f"{col}_{suffix}" for col in col_names]
+            ].rename(columns=lambda name: name[: -len(f"_{suffix}")])
+            for suffix in (1, 2)
+        ]
+    ).drop_duplicates(subset=ROW_ID)
+    # plain-tuple iteration is the cheapest way to build the per-node dicts
+    attributes = {
+        row_id: dict(zip(col_names, attrs))
+        for row_id, *attrs in records.itertuples(index=False, name=None)
+    }
+    nx.set_node_attributes(graph, attributes)
 
-    components = nx.connected_components(graph)
+    components = list(nx.connected_components(graph))
+
+    # components are independent of each other; scipy releases the GIL in the
+    # linkage computation, so threads suffice
+    results = Parallel(n_jobs=n_jobs, prefer="threads")(
+        delayed(_cluster_component)(graph.subgraph(component), cluster_threshold)
+        for component in components
+    )
 
     clustering = {}
     cluster_counter = 0
-    for component in components:
-        subgraph = graph.subgraph(component)
-        if len(subgraph.nodes) > 1:
-            clusters = make_cluster(subgraph, cluster_threshold)
-        else:
-            clusters = np.array([1])
-        clustering.update(dict(zip(subgraph.nodes(), clusters + cluster_counter)))
+    for component, (nodes, clusters) in zip(components, results):
+        clustering.update(dict(zip(nodes, clusters + cluster_counter)))
         cluster_counter += len(component)
     df_clusters = pd.DataFrame.from_dict(
         clustering, orient="index", columns=[DEDUPLICATION_ID_NAME]
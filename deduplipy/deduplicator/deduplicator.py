@@ -1,4 +1,3 @@
-from itertools import product
 from typing import Any, Callable, Dict, List, Optional, Union
 import logging
 
@@ -12,6 +11,7 @@ from deduplipy.config import DEDUPLICATION_ID_NAME, ROW_ID
 from deduplipy.string_metrics.string_metrics import (
     adjusted_ratio,
     adjusted_token_sort_ratio,
+    batch_adjusted_scores,
 )
 
 logger = logging.getLogger()
@@ -120,54 +120,37 @@ class Deduplicator:
 
         """
         X_pool = X.copy()
-        X_pool[ROW_ID] = np.arange(len(X_pool))
-        df_sample = X_pool.sample(n=int(n_samples ** 0.5))
+        X_pool[ROW_ID] = np.arange(len(X_pool), dtype=np.int32)
+        df_sample = X_pool.sample(n=int(n_samples ** 0.5)).sort_values(ROW_ID)
 
-        pairs_table = pd.DataFrame(
-            list(
-                product(
-                    df_sample[self.col_names + [ROW_ID]].values.tolist(),
-                    df_sample[self.col_names + [ROW_ID]].values.tolist(),
-                )
-            )
-        )
-
-        pairs_table[[f"{x}_1" for x in self.col_names + [ROW_ID]]] = pairs_table[
-            0
-        ].to_list()
-        pairs_table[[f"{x}_2" for x in self.col_names + [ROW_ID]]] = pairs_table[
-            1
-        ].to_list()
-        pairs_table.drop(columns=[0, 1], inplace=True)
-
-        pairs_table.sort_values([f"{ROW_ID}_1", f"{ROW_ID}_2"], inplace=True)
-
-        pairs_table = pairs_table[
-            pairs_table[f"{ROW_ID}_1"] <= pairs_table[f"{ROW_ID}_2"]
-        ]
+        values = df_sample[self.col_names].to_numpy()
+        idx_1, idx_2 = np.triu_indices(len(df_sample))
         self.pairs_col_names = [f"{x}_1" for x in self.col_names] + [
             f"{x}_2" for x in self.col_names
         ]
-        pairs_table = pairs_table[self.pairs_col_names].reset_index(drop=True)
+        pairs_table = pd.DataFrame(
+            np.concatenate([values[idx_1], values[idx_2]], axis=1),
+            columns=self.pairs_col_names,
+        )
         return pairs_table
 
-    def _calculate_string_similarities(self, X: pd.DataFrame) -> pd.DataFrame:
-        metrics_col_names = []
+    def _calculate_string_similarities(self, X: pd.DataFrame) -> np.ndarray:
+        metric_values = []
         for field, metrics in self.field_info.items():
+            values_1 = X[f"{field}_1"].to_numpy()
+            values_2 = X[f"{field}_2"].to_numpy()
             for metric in metrics:
-                metrics_col_name = f"{field}_{metric.__name__}"
-                X[metrics_col_name] = X.apply(
-                    lambda row: metric(row[f"{field}_1"], row[f"{field}_2"]), axis=1
-                )
-                metrics_col_names.append(metrics_col_name)
-        X["similarities"] = X.apply(
-            lambda row: [
-                row[metrics_col_name] for metrics_col_name in metrics_col_names
-            ],
-            axis=1,
-        )
-        X.drop(columns=metrics_col_names, inplace=True)
-        return X
+                # score the whole column pair in one parallel rapidfuzz call
+                # when possible, fall back to a per-pair loop for custom metrics
+                scores = batch_adjusted_scores(metric, values_1, values_2)
+                if scores is None:
+                    scores = np.fromiter(
+                        (metric(x_1, x_2) for x_1, x_2 in zip(values_1, values_2)),
+                        dtype=np.float32,
+                        count=len(X),
+                    )
+                metric_values.append(scores)
+        return np.column_stack(metric_values)
 
     def fit(self, X: pd.DataFrame, n_samples: int = 10_000) -> "Deduplicator":
         """
@@ -182,12 +165,12 @@ class Deduplicator:
         """
         pairs_table = self._create_pairs_table(X, n_samples)
         similarities = self._calculate_string_similarities(pairs_table)
-        self.active_learner.fit(similarities)
+        self.active_learner.fit(pairs_table, similarities)
         if self.verbose:
             logger.info("active learning finished")
         # calculate predictions on pairs table to use for blocking
-        y_pred = self.active_learner.predict(similarities["similarities"].to_list())
-        self.blocker.fit(similarities[self.pairs_col_names], y_pred)
+        y_pred = self.active_learner.predict(similarities)
+        self.blocker.fit(pairs_table[self.pairs_col_names], y_pred)
         if self.verbose:
             logger.info("blocking rules found")
             logger.info(
@@ -210,13 +193,13 @@ class Deduplicator:
             deduplication result where singletons have values for `deduplication_id`
 
         """
-        n_missing = len(X[X[DEDUPLICATION_ID_NAME].isnull()])
-        max_cluster_id = X[X[DEDUPLICATION_ID_NAME].notnull()][
-            DEDUPLICATION_ID_NAME
-        ].max()
-        X.loc[X[DEDUPLICATION_ID_NAME].isnull(), DEDUPLICATION_ID_NAME] = np.arange(
-            max_cluster_id + 1, max_cluster_id + 1 + n_missing
+        missing = X[DEDUPLICATION_ID_NAME].isnull().to_numpy()
+        max_cluster_id = X[DEDUPLICATION_ID_NAME].max()
+        cluster_ids = X[DEDUPLICATION_ID_NAME].to_numpy(copy=True)
+        cluster_ids[missing] = np.arange(
+            max_cluster_id + 1, max_cluster_id + 1 + missing.sum()
         )
+        X[DEDUPLICATION_ID_NAME] = cluster_ids
         return X
 
     def predict(
@@ -224,6 +207,7 @@ class Deduplicator:
         X: pd.DataFrame,
         score_threshold: float = 0.1,
         cluster_threshold: float = 0.5,
+        batch_size: int = 100_000,
     ) -> pd.DataFrame:
         """
         Predict on new data using the trained deduplicator.
@@ -232,12 +216,13 @@ class Deduplicator:
             X: Pandas dataframe with column as used when fitting deduplicator instance
             score_threshold: Classification threshold to use for filtering before starting hierarchical clustering
             cluster_threshold: threshold to apply in hierarchical clustering
+            batch_size: number of pairs scored per batch, bounds the memory used for scoring
 
         Returns: Pandas dataframe with a new column `deduplication_id`. Rows with the same `deduplication_id` are
         deduplicated.
 
         """
-        X[ROW_ID] = np.arange(len(X))
+        X[ROW_ID] = np.arange(len(X), dtype=np.int32)
         if self.verbose:
             logger.info("blocking started")
         pairs_table = self.blocker.transform(X)
@@ -245,22 +230,37 @@ class Deduplicator:
             logger.info("blocking finished")
             logger.info(f"Nr of pairs: {len(pairs_table)}")
             logger.info("scoring started")
-        scored_pairs_table = self._calculate_string_similarities(pairs_table)
-        scored_pairs_table["score"] = self.active_learner.predict_proba(
-            scored_pairs_table["similarities"].tolist()
-        )[:, 1]
-        scored_pairs_table.loc[
-            (
-                scored_pairs_table[[f"{x}_1" for x in self.col_names]].values
-                == scored_pairs_table[[f"{x}_2" for x in self.col_names]].values
-            ).all(axis=1),
-            "score",
-        ] = 1
+        # identical records get score 1; compare one int64 hash per record
+        # instead of all string columns cell by cell
+        row_hashes = pd.util.hash_pandas_object(
+            X[self.col_names], index=False
+        ).to_numpy()
+        # score in batches and keep only the pairs above the threshold, so the
+        # similarity and score buffers stay O(batch_size) instead of O(pairs)
+        scored_chunks = []
+        for start in range(0, len(pairs_table), batch_size):
+            chunk = pairs_table.iloc[start : start + batch_size]
+            similarities = self._calculate_string_similarities(chunk)
+            scores = self.active_learner.predict_proba(similarities)[:, 1].astype(
+                np.float32
+            )
+            identical = (
+                row_hashes[chunk[f"{ROW_ID}_1"].to_numpy()]
+                == row_hashes[chunk[f"{ROW_ID}_2"].to_numpy()]
+            )
+            scores = np.where(identical, np.float32(1.0), scores)
+            keep = scores >= score_threshold
+            survivors = chunk[keep].copy()
+            survivors["score"] = scores[keep]
+            scored_chunks.append(survivors)
+        if scored_chunks:
+            scored_pairs_table = pd.concat(scored_chunks, ignore_index=True)
+        else:
+            scored_pairs_table = pairs_table.assign(
+                score=np.zeros(len(pairs_table), dtype=np.float32)
+            )
         if self.verbose:
             logger.info("scoring finished")
-        scored_pairs_table = scored_pairs_table[
-            scored_pairs_table["score"] >= score_threshold
-        ]
         if self.verbose:
             logger.info(f"Nr of filtered pairs: {len(scored_pairs_table)}")
             logger.info("Clustering started")
@@ -271,7 +271,15 @@ class Deduplicator:
             col_names=self.col_names,
             cluster_threshold=cluster_threshold,
         )
-        X = X.merge(df_clusters, on=ROW_ID, how="left").drop(columns=[ROW_ID])
+        # row numbers are dense positions, so the cluster ids can be written
+        # into place directly instead of through a hash join; drop first so the
+        # column is assigned on a copy and the caller's frame stays untouched
+        X = X.drop(columns=[ROW_ID])
+        cluster_ids = np.full(len(X), np.nan)
+        cluster_ids[df_clusters[ROW_ID].to_numpy()] = df_clusters[
+            DEDUPLICATION_ID_NAME
+        ].to_numpy()
+        X[DEDUPLICATION_ID_NAME] = cluster_ids
         if self.verbose:
             logger.info("Clustering finished")
         X = self._add_singletons(X)
@@ -4,7 +4,6 @@ from .string_metrics import (
     adjusted_token_set_ratio,
     adjusted_token_sort_ratio,
 )
-from .transformer_metrics import transformer_cosine_similarity
 
 __all__ = [
     "adjusted_ratio",
@@ -1,5 +1,10 @@
+from functools import lru_cache
+from typing import Callable, Optional, Sequence
+
 import numpy as np
-from fuzzywuzzy.fuzz import partial_ratio, ratio, token_set_ratio, token_sort_ratio
+from rapidfuzz import process
+from rapidfuzz.fuzz import partial_ratio, ratio, token_set_ratio, token_sort_ratio
+from rapidfuzz.utils import default_process
 
 
 def length_adjustment(x_1: str, x_2: str) -> float:
@@ -32,6 +37,21 @@ def adjusted_ratio(x_1: str, x_2: str) -> float:
     return length_adjustment(x_1, x_2) * ratio(x_1, x_2)
 
 
+@lru_cache(maxsize=65_536)
+def _sorted_tokens(x: str) -> str:
+    """
+    Token-sort normalization as done inside `token_sort_ratio`: lowercase, strip non-alphanumeric characters and join
+    the sorted tokens. Cached with a bound because the same string appears in many pairs after blocking.
+
+    Args:
+        x: string to normalize
+
+    Returns:
+        normalized string
+    """
+    return " ".join(sorted(default_process(x).split()))
+
+
 def adjusted_token_sort_ratio(x_1: str, x_2: str) -> float:
     """
     Length adjusted version of `token_sort_ratio` metric. When at least one of the strings is short, the metric is
@@ -44,7 +64,7 @@ def adjusted_token_sort_ratio(x_1: str, x_2: str) -> float:
     Returns:
         adjusted `token_sort_ratio` metric
     """
-    return length_adjustment(x_1, x_2) * token_sort_ratio(x_1, x_2)
+    return length_adjustment(x_1, x_2) * ratio(_sorted_tokens(x_1), _sorted_tokens(x_2))
 
 
 def adjusted_token_set_ratio(x_1: str, x_2: str) -> float:
@@ -59,7 +79,9 @@ def adjusted_token_set_ratio(x_1: str, x_2: str) -> float:
     Returns:
         adjusted `token_set_ratio` metric
     """
-    return length_adjustment(x_1, x_2) * token_set_ratio(x_1, x_2)
+    return length_adjustment(x_1, x_2) * token_set_ratio(
+        x_1, x_2, processor=default_process
+    )
 
 
 def adjusted_partial_ratio(x_1: str, x_2: str) -> float:
@@ -74,3 +96,52 @@ def adjusted_partial_ratio(x_1: str, x_2: str) -> float:
         adjusted `partial_ratio` metric
     """
     return length_adjustment(x_1, x_2) * partial_ratio(x_1, x_2)
+
+
+# rapidfuzz scorer and processor backing each adjusted metric, used to score
+# whole pair columns in one parallel C call
+_BATCH_SCORERS = {
+    "adjusted_ratio": (ratio, None),
+    "adjusted_token_sort_ratio": (token_sort_ratio, default_process),
+    "adjusted_token_set_ratio": (token_set_ratio, default_process),
+    "adjusted_partial_ratio": (partial_ratio, None),
+}
+
+
+def _length_adjustment_array(
+    values_1: Sequence[str], values_2: Sequence[str]
+) -> np.ndarray:
+    shortest_lengths = np.minimum(
+        np.fromiter((len(x) for x in values_1), dtype=np.intp, count=len(values_1)),
+        np.fromiter((len(x) for x in values_2), dtype=np.intp, count=len(values_2)),
+    )
+    return (1 - np.exp(-0.2 * shortest_lengths)).astype(np.float32)
+
+
+def batch_adjusted_scores(
+    metric: Callable, values_1: Sequence[str], values_2: Sequence[str]
+) -> Optional[np.ndarray]:
+    """
+    Score all pairs for `metric` in a single pairwise rapidfuzz call when the metric has a known rapidfuzz scorer.
+
+    Args:
+        metric: one of the adjusted string metrics in this module
+        values_1: strings to compare
+        values_2: strings to compare, same length as `values_1`
+
+    Returns:
+        float32 array with the adjusted metric per pair, or `None` when `metric` has no batch counterpart
+    """
+    scorer_spec = _BATCH_SCORERS.get(metric.__name__)
+    if scorer_spec is None:
+        return None
+    scorer, processor = scorer_spec
+    scores = process.cpdist(
+        values_1,
+        values_2,
+        scorer=scorer,
+        processor=processor,
+        workers=-1,
+        dtype=np.float32,
+    )
+    return _length_adjustment_array(values_1, values_2) * scores
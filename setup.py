@@ -6,8 +6,8 @@ base_packages = [
     "scipy",
     "scikit-learn",
     "networkx",
-    "python-Levenshtein",
-    "fuzzywuzzy",
+    "joblib",
+    "rapidfuzz>=3.9",
     "modAL",
     "openpyxl",
     "pytest",
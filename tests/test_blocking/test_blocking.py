@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 from deduplipy.blocking import Blocking, all_rules
@@ -38,22 +39,27 @@ def test_base_case():
         {
             "name_1": ["frits", "frank", "fred"],
             "row_number_1": [0, 2, 7],
-            "fingerprint": ["fri:0", "fra:0", "fre:0"],
             "name_2": ["frits h", "frank h", "frederik"],
             "row_number_2": [1, 3, 8],
         }
     )
     pd.testing.assert_frame_equal(
-        result.reset_index(drop=True), expected.reset_index(drop=True)
+        result.drop(columns=["fingerprint"]).reset_index(drop=True),
+        expected.reset_index(drop=True),
     )
 
 
 def test__fingerprint():
     result = myBlocker._fingerprint(df)
     assert result.columns.to_list() == ["name", "row_number", "fingerprint"]
-    assert ["frits", 0, "fri:0"] in result.values
-    assert ["stan", 4, "sta:4"] in result.values
-    assert ["ahmet", 6, "ahme:1"] in result.values
+    assert result["fingerprint"].dtype == np.int64
+
+    def fingerprints(name):
+        return set(result[result["name"] == name]["fingerprint"])
+
+    assert fingerprints("frits") & fingerprints("frits h")
+    assert fingerprints("frank") & fingerprints("frank h")
+    assert not fingerprints("stan") & fingerprints("stijn")
 
 
 def test__create_pairs_table():
@@ -66,5 +72,6 @@ def test__create_pairs_table():
         "name_2",
         "row_number_2",
     ]
-    assert ["frits", 0, "fri:0", "frits h", 1] in result.values
-    assert ["frank", 2, "fra:0", "frank h", 3] in result.values
+    pairs = result[["name_1", "row_number_1", "name_2", "row_number_2"]]
+    assert ["frits", 0, "frits h", 1] in pairs.values
+    assert ["frank", 2, "frank h", 3] in pairs.values